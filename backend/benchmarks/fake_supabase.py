@@ -0,0 +1,178 @@
+"""In-process stand-in for the Supabase client.
+
+Implements the slice of the postgrest query-builder API the backend uses
+(``table(...).select/insert/upsert/delete`` with ``eq``/``gte``/``lt``/
+``lte``/``in_``/``order``/``limit`` filters) over plain dicts, plus the
+``mirror_chunk_checksums`` RPC from ``supabase/mirror_chunk_checksums.sql``,
+with an optional per-call latency to mimic the network round trip.
+"""
+import hashlib
+import threading
+import time
+
+# Column order hashed by mirror_chunk_checksums, per table.
+CHECKSUM_COLUMNS = {
+    "doctors": ("id", "name", "specialization", "available"),
+    "appointments": ("id", "patient_name", "doctor_id", "date"),
+}
+
+
+def _pg_text(value):
+    """Render a value the way Postgres casts it to text inside concat_ws."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    def __init__(self, client, table_name):
+        self._client = client
+        self._table_name = table_name
+        self._action = None
+        self._payload = None
+        self._columns = None
+        self._count = None
+        self._filters = []
+        self._order = None
+        self._limit = None
+
+    def _set(self, action, payload=None):
+        self._action = action
+        self._payload = payload
+        return self
+
+    def select(self, columns="*", count=None):
+        self._columns = None if columns == "*" else [c.strip() for c in columns.split(",")]
+        self._count = count
+        return self._set("select")
+
+    def insert(self, rows):
+        return self._set("insert", rows)
+
+    def upsert(self, rows):
+        return self._set("upsert", rows)
+
+    def delete(self):
+        return self._set("delete")
+
+    def eq(self, column, value):
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gte(self, column, value):
+        self._filters.append(lambda row: row.get(column) is not None and row[column] >= value)
+        return self
+
+    def lt(self, column, value):
+        self._filters.append(lambda row: row.get(column) is not None and row[column] < value)
+        return self
+
+    def lte(self, column, value):
+        self._filters.append(lambda row: row.get(column) is not None and row[column] <= value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self._filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def order(self, column, desc=False):
+        self._order = (column, desc)
+        return self
+
+    def limit(self, size):
+        self._limit = size
+        return self
+
+    def execute(self):
+        return self._client._execute(self)
+
+
+class FakeRpc:
+    def __init__(self, client, function_name, params):
+        self._client = client
+        self._function_name = function_name
+        self._params = params
+
+    def execute(self):
+        return self._client._call(self._function_name, self._params)
+
+
+class FakeSupabase:
+    """Dict-backed tables keyed by ``id``; ``latency`` seconds are slept per call."""
+
+    def __init__(self, latency=0.0, tables=None):
+        self.latency = latency
+        self.tables = {name: {row["id"]: dict(row) for row in rows} for name, rows in (tables or {}).items()}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def table(self, table_name):
+        return FakeQuery(self, table_name)
+
+    def rpc(self, function_name, params):
+        return FakeRpc(self, function_name, params)
+
+    def _call(self, function_name, params):
+        if self.latency:
+            time.sleep(self.latency)
+        if function_name != "mirror_chunk_checksums":
+            raise RuntimeError(f"function {function_name} does not exist")
+        with self._lock:
+            self.calls.append((function_name, "rpc"))
+            columns = CHECKSUM_COLUMNS[params["table_name"]]
+            chunks = {}
+            for row_id in sorted(self.tables.get(params["table_name"], {})):
+                if not params["min_id"] <= row_id < params["max_id"]:
+                    continue
+                row = self.tables[params["table_name"]][row_id]
+                line = "|".join(_pg_text(row.get(column)) for column in columns)
+                chunks.setdefault(row_id // params["chunk_size"], []).append(line)
+            return FakeResponse([
+                {"chunk": chunk, "row_count": len(lines),
+                 "checksum": hashlib.md5("\n".join(lines).encode("utf-8")).hexdigest()}
+                for chunk, lines in chunks.items()
+            ])
+
+    def _execute(self, query):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls.append((query._table_name, query._action))
+            table = self.tables.setdefault(query._table_name, {})
+            payload = query._payload
+            if query._action in ("insert", "upsert"):
+                rows = payload if isinstance(payload, list) else [payload]
+                for row in rows:
+                    row = dict(row)
+                    if "id" not in row:
+                        row["id"] = max(table, default=0) + 1
+                    elif query._action == "insert" and row["id"] in table:
+                        raise RuntimeError(f"duplicate key value violates unique constraint on {query._table_name}.id")
+                    table[row["id"]] = row
+                return FakeResponse(rows)
+
+            matched = [row for row in table.values() if all(f(row) for f in query._filters)]
+            if query._action == "delete":
+                for row in matched:
+                    del table[row["id"]]
+                return FakeResponse(matched)
+
+            column, desc = query._order or ("id", False)
+            matched.sort(key=lambda row: row.get(column), reverse=desc)
+            total = len(matched)
+            if query._limit is not None:
+                matched = matched[:query._limit]
+            if query._columns is not None:
+                matched = [{c: row.get(c) for c in query._columns} for row in matched]
+            else:
+                matched = [dict(row) for row in matched]
+            return FakeResponse(matched, total if query._count else None)
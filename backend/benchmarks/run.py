@@ -0,0 +1,332 @@
+"""Benchmark and load-test the Flask routes against a seeded local database.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/run.py                     # run and compare with the baseline
+    python benchmarks/run.py --update-baseline   # store this run as the new baseline
+    python benchmarks/run.py --scenarios small --supabase-latency 0.05
+
+Each run copies ``hospital_management.db`` to a scratch file, brings it up
+to date with the Alembic migrations, and seeds it with the doctor and
+appointment volumes of each scenario. The module-level ``supabase`` client
+is replaced by ``FakeSupabase``, so no request leaves the process. Every
+endpoint is warmed up, then driven ``--repeats`` times by ``--workers``
+concurrent clients. The reported throughput and p50/p95/p99 latency are
+the medians of those runs, and the spread between runs is recorded too.
+Results are written as JSON.
+
+A result counts as a regression when its median p95 rises, or its median
+throughput falls, by more than the allowed tolerance. The tolerance is
+``--tolerance`` or ``--noise-factor`` times the larger run-to-run spread
+seen in the baseline or the current run, whichever is bigger. A p95 change
+must also exceed ``--min-delta-ms`` in absolute terms. A baseline result
+that this run did not produce (for a scenario it ran) also counts as a
+regression. Any regression, or a missing baseline without
+``--allow-missing-baseline``, makes the run exit non-zero.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SCENARIOS = {
+    "small": {"doctors": 50, "appointments_per_doctor": 5},
+    "large": {"doctors": 500, "appointments_per_doctor": 200},
+}
+
+# Regression thresholds; see the module docstring for how they combine.
+TOLERANCE = 0.25
+NOISE_FACTOR = 2.0
+MIN_DELTA_MS = 1.0
+
+SPECIALIZATIONS = ["Cardiologist", "Dermatologist", "Neurologist", "Pediatrician", "Oncologist",
+                   "Orthopedist", "Psychiatrist", "Radiologist", "Surgeon", "Urologist"]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def seed(app_module, doctors, appointments_per_doctor, seed_value=42):
+    """Bulk-insert doctors and appointments, keeping the slot counters consistent."""
+    db = app_module.db
+    rng = random.Random(seed_value)
+    start = date(2024, 1, 1)
+    with app_module.app.app_context():
+        first_id = (db.session.query(db.func.max(app_module.Doctor.id)).scalar() or 0) + 1
+        db.session.execute(db.insert(app_module.Doctor), [
+            {"name": f"Dr. Bench {i}", "specialization": rng.choice(SPECIALIZATIONS),
+             "available": True, "daily_capacity": 10_000}
+            for i in range(doctors)
+        ])
+        doctor_ids = list(range(first_id, first_id + doctors))
+        counters = {}
+        batch = []
+        for doctor_id in doctor_ids:
+            for _ in range(appointments_per_doctor):
+                day = start + timedelta(days=rng.randrange(730))
+                counters[(doctor_id, day)] = counters.get((doctor_id, day), 0) + 1
+                batch.append({"patient_name": f"Patient {rng.randrange(100_000)}", "doctor_id": doctor_id, "date": day})
+                if len(batch) == 5000:
+                    db.session.execute(db.insert(app_module.Appointment), batch)
+                    batch = []
+        if batch:
+            db.session.execute(db.insert(app_module.Appointment), batch)
+        if counters:
+            db.session.execute(db.insert(app_module.DoctorDaySlots), [
+                {"doctor_id": doctor_id, "date": day, "booked": booked}
+                for (doctor_id, day), booked in counters.items()
+            ])
+        db.session.commit()
+    app_module.doctor_cache.invalidate()
+    return doctor_ids
+
+
+def dispose_engine(app_module):
+    with app_module.app.app_context():
+        app_module.db.engine.dispose()
+
+
+def drive(app, make_request, requests, workers, before=None):
+    """Run ``make_request(client, i)`` ``requests`` times across ``workers`` threads."""
+    latencies, errors = [], 0
+
+    def one(i):
+        if before is not None:
+            before()
+        client = app.test_client()
+        started = time.perf_counter()
+        response = make_request(client, i)
+        elapsed = time.perf_counter() - started
+        response.close()
+        return elapsed, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for elapsed, status in pool.map(one, range(requests)):
+            latencies.append(elapsed)
+            if status >= 400:
+                errors += 1
+    wall = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / wall, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def endpoints(app_module, doctor_ids, rng):
+    """Yield ``(name, make_request, before, share)`` for every benchmarked route.
+
+    ``share`` scales ``--requests`` down for endpoints whose cost grows with
+    the whole appointment history, so the large scenario finishes in minutes.
+    """
+    mid_date = "2025-01-01"
+    with app_module.app.test_client() as client:
+        deep_cursor = client.get("/appointments", query_string={"date_from": mid_date, "limit": 1}).get_json()
+    deep_cursor = deep_cursor["appointments"] and app_module.encode_cursor(
+        app_module.Appointment(id=deep_cursor["appointments"][0]["id"], date=date.fromisoformat(mid_date)))
+
+    def pick_doctor():
+        return rng.choice(doctor_ids)
+
+    yield "GET /doctors (cold cache)", lambda c, i: c.get("/doctors"), app_module.doctor_cache.invalidate, 1
+    yield "GET /doctors (warm cache)", lambda c, i: c.get("/doctors"), None, 1
+    yield "GET /doctors (fields=appointments)", lambda c, i: c.get("/doctors?fields=id,appointments"), None, 0.05
+    yield "GET /appointments (first page)", lambda c, i: c.get("/appointments?limit=50"), None, 1
+    if deep_cursor:
+        yield "GET /appointments (deep page)", lambda c, i: c.get(
+            "/appointments", query_string={"limit": 50, "cursor": deep_cursor}), None, 1
+    yield "GET /doctors/<id>/appointments", lambda c, i: c.get(f"/doctors/{pick_doctor()}/appointments?limit=50"), None, 1
+    yield "GET /doctors/<id>/availability", lambda c, i: c.get(
+        f"/doctors/{pick_doctor()}/availability?date_from=2024-06-01&date_to=2024-06-30"), None, 1
+    yield "POST /appointments", lambda c, i: c.post("/appointments", json={
+        "patient_name": f"Load {i}", "doctor_id": pick_doctor(),
+        "date": (date(2026, 1, 1) + timedelta(days=i % 365)).isoformat()}), None, 1
+    yield "GET /doctors/search", lambda c, i: c.get(
+        "/doctors/search", query_string={"q": f"bench {i % 100}", "specialization": SPECIALIZATIONS[i % 10]}), None, 1
+    yield "GET /specializations", lambda c, i: c.get("/specializations", query_string={"q": SPECIALIZATIONS[i % 10][:3]}), None, 1
+    yield "GET /test_supabase", lambda c, i: c.get("/test_supabase"), None, 1
+
+
+def measure(app, make_request, requests, workers, before, warmup, repeats):
+    """Warm the endpoint up, then summarize ``repeats`` runs by their medians."""
+    if warmup:
+        drive(app, make_request, warmup, workers, before)
+    runs = [drive(app, make_request, requests, workers, before) for _ in range(repeats)]
+    result = {key: round(statistics.median(run[key] for run in runs), 3) for key in runs[0]}
+    for key in ("p95_ms", "throughput_rps"):
+        values = [run[key] for run in runs]
+        # Relative run-to-run spread, used to size the regression threshold.
+        result[f"{key}_spread"] = round((max(values) - min(values)) / result[key], 3) if result[key] else 0.0
+    result["repeats"] = repeats
+    return result
+
+
+def compare(results, baseline, scenarios, tolerance, noise_factor, min_delta_ms):
+    regressions = []
+    for key, base in baseline.get("results", {}).items():
+        if key.split("/", 1)[0] not in scenarios:
+            continue
+        current = results.get(key)
+        if current is None:
+            regressions.append(f"{key}: in the baseline but missing from this run")
+            continue
+        p95_tolerance = max(tolerance, noise_factor * max(base.get("p95_ms_spread", 0), current["p95_ms_spread"]))
+        slower = current["p95_ms"] - base["p95_ms"]
+        if current["p95_ms"] > base["p95_ms"] * (1 + p95_tolerance) and slower > min_delta_ms:
+            regressions.append(f"{key}: p95 {base['p95_ms']} ms -> {current['p95_ms']} ms "
+                               f"(allowed +{p95_tolerance:.0%})")
+        throughput_tolerance = min(max(tolerance, noise_factor * max(
+            base.get("throughput_rps_spread", 0), current["throughput_rps_spread"])), 0.9)
+        if current["throughput_rps"] < base["throughput_rps"] * (1 - throughput_tolerance):
+            regressions.append(f"{key}: throughput {base['throughput_rps']} -> {current['throughput_rps']} req/s "
+                               f"(allowed -{throughput_tolerance:.0%})")
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{key}: errors {base['errors']} -> {current['errors']}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--doctors", type=int, help="override the doctor count of every scenario")
+    parser.add_argument("--appointments-per-doctor", type=int, help="override the history size of every scenario")
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint per run")
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests per endpoint before the runs")
+    parser.add_argument("--repeats", type=int, default=5, help="measured runs per endpoint; medians are reported")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--supabase-latency", type=float, default=0.02, help="seconds per fake Supabase call")
+    parser.add_argument("--database", default=os.path.join(BACKEND_DIR, "hospital_management.db"),
+                        help="SQLite file copied as the starting point for each scenario")
+    parser.add_argument("--output", default=os.path.join(HERE, "results.json"))
+    parser.add_argument("--baseline", default=os.path.join(HERE, "baseline.json"))
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="minimum allowed relative change in median p95 or throughput")
+    parser.add_argument("--noise-factor", type=float, default=NOISE_FACTOR,
+                        help="multiple of the measured run-to-run spread also allowed")
+    parser.add_argument("--min-delta-ms", type=float, default=MIN_DELTA_MS)
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="exit 0 instead of failing when there is no baseline to compare with")
+    args = parser.parse_args(argv)
+
+    scratch_dir = tempfile.mkdtemp(prefix="bench-")
+    scratch_db = os.path.join(scratch_dir, "bench.db")
+    os.environ["SUPABASE_DATABASE_URL"] = f"sqlite:///{scratch_db}"
+    os.environ["OUTBOX_AUTOSTART"] = "false"
+    sys.path.insert(0, BACKEND_DIR)
+    sys.path.insert(0, HERE)
+    import app as app_module
+    from fake_supabase import FakeSupabase
+    from flask_migrate import upgrade
+
+    logging.getLogger(app_module.__name__).setLevel(logging.WARNING)
+    logging.getLogger("alembic").setLevel(logging.WARNING)
+    app_module.supabase = FakeSupabase(latency=args.supabase_latency)
+
+    results = {}
+    try:
+        for scenario in args.scenarios:
+            volumes = dict(SCENARIOS[scenario])
+            if args.doctors is not None:
+                volumes["doctors"] = args.doctors
+            if args.appointments_per_doctor is not None:
+                volumes["appointments_per_doctor"] = args.appointments_per_doctor
+
+            # Start every scenario from a fresh copy so they don't see each other's data.
+            dispose_engine(app_module)
+            shutil.copyfile(args.database, scratch_db)
+            with app_module.app.app_context():
+                upgrade(directory=os.path.join(BACKEND_DIR, "migrations"))
+            doctor_ids = seed(app_module, **volumes)
+            print(f"[{scenario}] seeded {volumes['doctors']} doctors x {volumes['appointments_per_doctor']} appointments")
+
+            rng = random.Random(7)
+            for name, make_request, before, share in endpoints(app_module, doctor_ids, rng):
+                if "warm cache" in name:
+                    app_module.app.test_client().get("/doctors")
+                requests = max(int(args.requests * share), args.workers)
+                warmup = max(int(args.warmup * share), args.workers) if args.warmup else 0
+                result = measure(app_module.app, make_request, requests, args.workers, before, warmup, args.repeats)
+                key = f"{scenario}/{name}"
+                results[key] = result
+                print(f"  {name:40} {result['throughput_rps']:>9.1f} req/s  p50 {result['p50_ms']:>8.2f}  "
+                      f"p95 {result['p95_ms']:>8.2f}  p99 {result['p99_ms']:>8.2f} ms  errors {result['errors']}")
+    finally:
+        dispose_engine(app_module)
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "repeats": args.repeats,
+            "workers": args.workers,
+            "supabase_latency": args.supabase_latency,
+            "scenarios": {name: SCENARIOS[name] for name in args.scenarios},
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.update_baseline:
+        shutil.copyfile(args.output, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        if args.allow_missing_baseline:
+            print(f"No baseline at {args.baseline}; skipping the comparison.")
+            return 0
+        print("=" * 70)
+        print(f"NO BASELINE at {args.baseline}: nothing to compare against.")
+        print("Store one with --update-baseline, or pass --allow-missing-baseline.")
+        print("=" * 70)
+        return 2
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    skipped = sum(1 for key in baseline.get("results", {}) if key.split("/", 1)[0] not in args.scenarios)
+    if skipped:
+        print(f"Skipping {skipped} baseline result(s) from scenarios not run this time.")
+    regressions = compare(results, baseline, args.scenarios, args.tolerance, args.noise_factor, args.min_delta_ms)
+    if regressions:
+        print("=" * 70)
+        print(f"PERFORMANCE REGRESSION ({len(regressions)} vs {args.baseline}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        print("=" * 70)
+        return 1
+    print("No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
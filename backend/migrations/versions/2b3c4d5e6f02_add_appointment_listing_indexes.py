@@ -0,0 +1,28 @@
+"""add appointment listing indexes
+
+Revision ID: 2b3c4d5e6f02
+Revises: 1a2b3c4d5e01
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b3c4d5e6f02'
+down_revision = '1a2b3c4d5e01'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.create_index('ix_appointments_doctor_id_date', ['doctor_id', 'date'], unique=False)
+        batch_op.create_index('ix_appointments_date_id', ['date', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index('ix_appointments_date_id')
+        batch_op.drop_index('ix_appointments_doctor_id_date')
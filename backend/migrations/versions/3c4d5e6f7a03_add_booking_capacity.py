@@ -0,0 +1,41 @@
+"""add booking capacity
+
+Revision ID: 3c4d5e6f7a03
+Revises: 2b3c4d5e6f02
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c4d5e6f7a03'
+down_revision = '2b3c4d5e6f02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('doctors', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('daily_capacity', sa.Integer(), nullable=False, server_default='20'))
+
+    op.create_table('doctor_day_slots',
+    sa.Column('doctor_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('booked', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['doctor_id'], ['doctors.id'], ),
+    sa.PrimaryKeyConstraint('doctor_id', 'date')
+    )
+
+    # Seed the counters from the bookings that already exist.
+    op.execute(
+        "INSERT INTO doctor_day_slots (doctor_id, date, booked) "
+        "SELECT doctor_id, date, COUNT(*) FROM appointments GROUP BY doctor_id, date"
+    )
+
+
+def downgrade():
+    op.drop_table('doctor_day_slots')
+    with op.batch_alter_table('doctors', schema=None) as batch_op:
+        batch_op.drop_column('daily_capacity')
@@ -0,0 +1,28 @@
+"""add outbox status
+
+Revision ID: 5e6f7a8b9c05
+Revises: 3c4d5e6f7a03
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e6f7a8b9c05'
+down_revision = '3c4d5e6f7a03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('supabase_outbox', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'))
+        batch_op.create_index('ix_supabase_outbox_status_id', ['status', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('supabase_outbox', schema=None) as batch_op:
+        batch_op.drop_index('ix_supabase_outbox_status_id')
+        batch_op.drop_column('status')
@@ -0,0 +1,32 @@
+-- Per-chunk checksums of the mirrored tables, used by `flask reconcile`.
+--
+-- Rows are grouped by id / chunk_size within [min_id, max_id). Each chunk
+-- hashes its rows in id order, one line per row with the columns joined by
+-- '|'. The reconciler builds the same lines for the local database, so the
+-- two sides compare chunk by chunk without transferring the rows.
+--
+-- Apply once in the Supabase SQL editor.
+
+create or replace function mirror_chunk_checksums(table_name text, min_id bigint, max_id bigint, chunk_size bigint)
+returns table (chunk bigint, row_count bigint, checksum text)
+language plpgsql stable as $$
+begin
+  if table_name = 'doctors' then
+    return query
+      select d.id / chunk_size, count(*),
+             md5(string_agg(concat_ws('|', d.id, d.name, d.specialization, coalesce(d.available::text, '')), E'\n' order by d.id))
+      from doctors d
+      where d.id >= min_id and d.id < max_id
+      group by d.id / chunk_size;
+  elsif table_name = 'appointments' then
+    return query
+      select a.id / chunk_size, count(*),
+             md5(string_agg(concat_ws('|', a.id, a.patient_name, a.doctor_id, a.date), E'\n' order by a.id))
+      from appointments a
+      where a.id >= min_id and a.id < max_id
+      group by a.id / chunk_size;
+  else
+    raise exception 'unsupported table %', table_name;
+  end if;
+end;
+$$;
@@ -0,0 +1,3 @@
+def pytest_addoption(parser):
+    parser.addoption("--database-url",
+                     help="Scratch database for the booking contention test; use PostgreSQL to exercise real races.")
@@ -0,0 +1,140 @@
+"""Fire concurrent bookings at one doctor and check the daily capacity holds.
+
+Run from ``backend/``::
+
+    python -m pytest tests/test_booking_contention.py --database-url postgresql://localhost/scratch
+
+or directly, which also reports throughput::
+
+    python tests/test_booking_contention.py --requests 200 --capacity 25 --workers 32 \\
+        --database-url postgresql://localhost/scratch
+
+Without ``--database-url`` both run against a throwaway SQLite file. SQLite
+takes a database-wide write lock, so the bookings are serialized and never
+race; there the test only checks that the slot counter and the
+appointments table agree. It proves no overbooking only when
+``--database-url`` points at a scratch PostgreSQL database, where the
+concurrent transactions really contend for the ``doctor_day_slots`` row.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_contention(database_url, requests, capacity, workers):
+    """Book ``requests`` appointments for one doctor and day from ``workers`` threads."""
+    os.environ["SUPABASE_DATABASE_URL"] = database_url
+    os.environ["OUTBOX_AUTOSTART"] = "false"
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    from app import app, db, Appointment, Doctor, DoctorDaySlots, SupabaseOutbox
+
+    if app.config["SQLALCHEMY_DATABASE_URI"] != database_url:
+        pytest.skip(f"app was already imported against {app.config['SQLALCHEMY_DATABASE_URI']}")
+
+    with app.app_context():
+        db.create_all()
+        outbox_start = db.session.query(db.func.max(SupabaseOutbox.id)).scalar() or 0
+        doctor = Doctor(name="Contention Test", specialization="Load", daily_capacity=capacity)
+        db.session.add(doctor)
+        db.session.commit()
+        doctor_id = doctor.id
+    day = date.today()
+
+    def book(i):
+        client = app.test_client()
+        response = client.post("/appointments", json={"patient_name": f"Patient {i}", "doctor_id": doctor_id,
+                                                       "date": day.isoformat()})
+        return response.status_code
+
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            statuses = list(pool.map(book, range(requests)))
+        elapsed = time.perf_counter() - started
+
+        with app.app_context():
+            booked = Appointment.query.filter_by(doctor_id=doctor_id).count()
+            counter = db.session.get(DoctorDaySlots, (doctor_id, day))
+            counter = counter.booked if counter else 0
+    finally:
+        # Leave a shared scratch database as it was found.
+        with app.app_context():
+            Appointment.query.filter_by(doctor_id=doctor_id).delete()
+            DoctorDaySlots.query.filter_by(doctor_id=doctor_id).delete()
+            SupabaseOutbox.query.filter(SupabaseOutbox.id > outbox_start).delete()
+            Doctor.query.filter_by(id=doctor_id).delete()
+            db.session.commit()
+            db.engine.dispose()
+
+    created = statuses.count(201)
+    rejected = statuses.count(409)
+    return {"created": created, "rejected": rejected, "other": len(statuses) - created - rejected,
+            "appointments": booked, "counter": counter, "elapsed": elapsed}
+
+
+@pytest.fixture
+def database_url(request, tmp_path):
+    return request.config.getoption("--database-url", default=None) or f"sqlite:///{tmp_path / 'contention.db'}"
+
+
+def test_concurrent_bookings_never_exceed_capacity(database_url):
+    result = run_contention(database_url, requests=100, capacity=25, workers=16)
+
+    assert result["other"] == 0
+    assert result["appointments"] <= 25, "doctor overbooked"
+    assert result["created"] == result["appointments"] == result["counter"] == 25
+    assert result["rejected"] == 75
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--capacity", type=int, default=25)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--min-throughput", type=float, default=50.0, help="bookings per second")
+    parser.add_argument("--database-url")
+    args = parser.parse_args(argv)
+
+    scratch = None
+    if args.database_url is None:
+        scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        scratch.close()
+        args.database_url = f"sqlite:///{scratch.name}"
+    try:
+        result = run_contention(args.database_url, args.requests, args.capacity, args.workers)
+    finally:
+        if scratch is not None:
+            os.unlink(scratch.name)
+
+    throughput = args.requests / result["elapsed"]
+    print(f"requests={args.requests} capacity={args.capacity} workers={args.workers}")
+    print(f"created={result['created']} rejected={result['rejected']} other={result['other']}")
+    print(f"appointments={result['appointments']} counter={result['counter']} "
+          f"elapsed={result['elapsed']:.3f}s throughput={throughput:.1f}/s")
+
+    failures = []
+    if result["appointments"] > args.capacity:
+        failures.append(f"overbooked: {result['appointments']} appointments for capacity {args.capacity}")
+    if result["appointments"] != result["created"] or result["counter"] != result["appointments"]:
+        failures.append(f"counter drift: created={result['created']} appointments={result['appointments']} "
+                        f"counter={result['counter']}")
+    if result["created"] < min(args.requests, args.capacity):
+        failures.append(f"underbooked: only {result['created']} of {min(args.requests, args.capacity)} slots taken")
+    if throughput < args.min_throughput:
+        failures.append(f"throughput {throughput:.1f}/s below {args.min_throughput}/s")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())